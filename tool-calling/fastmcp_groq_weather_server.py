@@ -12,6 +12,9 @@ Usage:
                --tool groq-weather-server/get_weather_with_groq \
                --params '{"query":"What is the weather like in Bengaluru?"}'
 
+    Add "natural_language": true to the params to get a phrased reply instead
+    of the raw weather JSON.
+
 The CLI command above uses the official MCP reference client to connect over
 STDIO. You can also point FastMCP's Python client at this script for in-memory
 testing (see README for details).
@@ -19,14 +22,23 @@ testing (see README for details).
 
 from __future__ import annotations
 
-import json
+import asyncio
+import functools
 import os
-from typing import Dict, List
-
-import requests
+import re
+import sys
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+import anyio
+import httpx
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from groq import Groq
-from mcp.server.fastmcp import FastMCP
+from groq import AsyncGroq
+from mcp.server.fastmcp import Context, FastMCP
+
+from semantic_cache import SemanticCache
 
 load_dotenv()
 
@@ -43,21 +55,60 @@ def require_env(var_name: str) -> str:
     return value
 
 
-mcp = FastMCP("groq-weather-server")
-client = Groq(api_key=require_env("GROQ_API_KEY"))
+client = AsyncGroq(api_key=require_env("GROQ_API_KEY"))
+
+HTTP = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=3,  # Connection failures only; status retries are below.
+        limits=httpx.Limits(max_keepalive_connections=20),
+    ),
+    timeout=10.0,
+)
+
+# Transient OpenWeatherMap statuses worth retrying (httpx only retries failed
+# connections, not error responses).
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Weather changes on the order of minutes, so repeat lookups for the same
+# location are answered from memory instead of re-hitting OpenWeatherMap.
+WEATHER_CACHE: TTLCache = TTLCache(maxsize=512, ttl=300)
+
+# Lookups currently on the wire, so concurrent callers asking for the same
+# location await one shared request instead of issuing duplicates.
+INFLIGHT_WEATHER: Dict[str, "asyncio.Task[str]"] = {}
+
+# Final replies keyed by query meaning, so rephrasings of a recent question skip
+# both LLM round-trips. Set SEMANTIC_CACHE_PATH to persist it across restarts.
+REPLY_CACHE = SemanticCache(ttl=300, path=os.getenv("SEMANTIC_CACHE_PATH"))
+
+
+@asynccontextmanager
+async def lifespan(_server: FastMCP) -> AsyncIterator[None]:
+    """Persist the reply cache and close the shared HTTP client on shutdown."""
+
+    try:
+        yield
+    finally:
+        await asyncio.to_thread(REPLY_CACHE.save)
+        await HTTP.aclose()
 
 
-def get_current_weather(location: str) -> str:
+mcp = FastMCP("groq-weather-server", lifespan=lifespan)
+
+
+async def get_current_weather(location: str) -> str:
     """
     Fetch live weather data from OpenWeatherMap if OPENWEATHER_API_KEY is set.
 
     Falls back to a deterministic demo payload so the server still works even
-    without the external dependency.
+    without the external dependency. Live results are served from the TTL
+    cache when fresh, and concurrent calls for one location share a request.
     """
 
     api_key = os.getenv("OPENWEATHER_API_KEY")
     if not api_key:
-        return json.dumps(
+        return orjson.dumps(
             {
                 "location": location,
                 "temperature_c": 24.0,
@@ -65,20 +116,48 @@ def get_current_weather(location: str) -> str:
                 "description": "partly cloudy (demo)",
                 "note": "Set OPENWEATHER_API_KEY for real data.",
             }
-        )
+        ).decode()
+
+    cache_key = location.strip().lower()
+    cached = WEATHER_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Join an in-flight request for this location if there is one.
+    pending = INFLIGHT_WEATHER.get(cache_key)
+    if pending is None:
+        pending = asyncio.ensure_future(fetch_weather(location, api_key))
+        INFLIGHT_WEATHER[cache_key] = pending
+        pending.add_done_callback(lambda _: INFLIGHT_WEATHER.pop(cache_key, None))
+    # Shield the shared request so one caller being cancelled doesn't fail the rest.
+    return await asyncio.shield(pending)
+
+
+async def get_with_retries(url: str, params: Dict[str, str]) -> httpx.Response:
+    """GET url, retrying up to three times with backoff on 429/5xx responses."""
+
+    response = await HTTP.get(url, params=params)
+    for attempt in range(3):
+        if response.status_code not in RETRY_STATUSES:
+            break
+        await asyncio.sleep(0.2 * 2**attempt)
+        response = await HTTP.get(url, params=params)
+    return response
+
+
+async def fetch_weather(location: str, api_key: str) -> str:
+    """Call OpenWeatherMap and cache the condensed payload on success."""
 
     params = {"q": location, "units": "metric", "appid": api_key}
     try:
-        response = requests.get(
-            "https://api.openweathermap.org/data/2.5/weather",
-            params=params,
-            timeout=10,
+        response = await get_with_retries(
+            "https://api.openweathermap.org/data/2.5/weather", params
         )
         response.raise_for_status()
-    except requests.RequestException as exc:
-        return json.dumps({"error": f"OpenWeatherMap request failed: {exc}"})
+    except httpx.HTTPError as exc:
+        return orjson.dumps({"error": f"OpenWeatherMap request failed: {exc}"}).decode()
 
-    payload = response.json()
+    payload = orjson.loads(response.content)
     weather = {
         "location": location,
         "temperature_c": payload["main"]["temp"],
@@ -89,96 +168,193 @@ def get_current_weather(location: str) -> str:
         "description": payload["weather"][0]["description"],
         "icon": payload["weather"][0]["icon"],
     }
-    return json.dumps(weather)
-
-
-def tool_schema() -> List[Dict]:
-    """Return the Groq tool definition (used in both LLM calls)."""
-
-    return [
-        {
-            "type": "function",
-            "function": {
-                "name": "get_current_weather",
-                "description": "Get the current weather in a given location",
-                "parameters": {
-                    "type": "object",
-                    "properties": {
-                        "location": {
-                            "type": "string",
-                            "description": "City and optional country (e.g. Bengaluru, IN)",
-                        }
-                    },
-                    "required": ["location"],
+    result = orjson.dumps(weather).decode()
+    WEATHER_CACHE[location.strip().lower()] = result
+    return result
+
+
+# Groq tool definition shared by both LLM calls; built once at import time.
+TOOL_SCHEMA: List[Dict] = [
+    {
+        "type": "function",
+        "function": {
+            "name": "get_current_weather",
+            "description": "Get the current weather in a given location",
+            "parameters": {
+                "type": "object",
+                "properties": {
+                    "location": {
+                        "type": "string",
+                        "description": "City and optional country (e.g. Bengaluru, IN)",
+                    }
                 },
+                "required": ["location"],
             },
-        }
-    ]
+        },
+    }
+]
+
+# Both completion calls with their static settings bound once at import time.
+# Both send TOOL_SCHEMA: tool definitions lead the prompt, so the follow-up
+# only shares the first call's cached prefix if it carries them too. The
+# follow-up sets tool_choice="none" so the model must answer in text.
+CREATE_WITH_TOOLS = functools.partial(
+    client.chat.completions.create,
+    model="openai/gpt-oss-20b",
+    temperature=0,
+    max_tokens=300,
+    tools=TOOL_SCHEMA,
+    tool_choice="auto",
+)
+CREATE_FOLLOW_UP = functools.partial(
+    client.chat.completions.create,
+    model="openai/gpt-oss-20b",
+    tools=TOOL_SCHEMA,
+    tool_choice="none",
+    temperature=0,
+    max_tokens=300,
+    stream=True,
+)
+
+
+# Plain "what's the weather in X" questions are answered with this local
+# template instead of a second LLM call; anything else still goes to Groq.
+WEATHER_TEMPLATE = (
+    "🌤️ {location} – Current Weather\n"
+    "- Temperature: {temperature_c:.1f} °C\n"
+    "- Feels like: {feels_like_c:.1f} °C\n"
+    "- Humidity: {humidity_pct} %\n"
+    "- Pressure: {pressure_hpa} hPa\n"
+    "- Wind: {wind_speed_mps} m/s\n"
+    "- Conditions: {description}\n"
+)
+PLAIN_REPORT_QUERY = re.compile(
+    r"^\s*(?:what(?:'s|\s+is)\s+)?(?:the\s+)?(?:current\s+)?weather(?:\s+like)?"
+    r"\s+(?:in|at|for)\s+(?P<place>.+?)\s*[?.!]?\s*$",
+    re.IGNORECASE,
+)
+
+
+def normalize_place(text: str) -> str:
+    """Lower-case a place name and collapse punctuation/whitespace runs."""
+
+    return " ".join(re.split(r"[\W_]+", text.lower())).strip()
+
+
+def render_weather_report(
+    query: str, location: str, weather_data: str
+) -> Optional[str]:
+    """
+    Render a plain weather report locally, or return None if the LLM is needed.
+
+    The template only fits when the question names nothing but the location
+    the tool was called with; extra words ("tomorrow", "in fahrenheit", ...)
+    mean the user wants more than current conditions.
+    """
+
+    match = PLAIN_REPORT_QUERY.match(query)
+    if not match or normalize_place(match.group("place")) != normalize_place(location):
+        return None
+
+    try:
+        return WEATHER_TEMPLATE.format(**orjson.loads(weather_data))
+    except (KeyError, ValueError):
+        # Error and demo payloads lack some fields; let the LLM explain those.
+        return None
+
+
+async def execute_tool_call(call) -> str:
+    """Run one tool call requested by the model and return its JSON output."""
+
+    if call.function.name != "get_current_weather":
+        error = f"Unknown tool: {call.function.name}"
+        return orjson.dumps({"error": error}).decode()
+    return await get_current_weather(**orjson.loads(call.function.arguments))
 
 
 @mcp.tool()
-def get_weather_with_groq(query: str) -> str:
+async def get_weather_with_groq(
+    query: str, ctx: Context, natural_language: bool = False
+) -> str:
     """
     Let Groq's LLM decide whether to call get_current_weather, then return the reply.
+
+    Every tool call the model requests is executed concurrently. By default
+    the structured weather JSON (one line per call) is returned as soon as the
+    tools have run, skipping a second LLM round-trip. Set natural_language=True
+    to have Groq phrase the answer; simple weather reports are rendered from a
+    local template, while other replies are streamed, with each text chunk
+    forwarded to the client as a progress notification.
     """
 
-    response = client.chat.completions.create(
-        model="openai/gpt-oss-20b",
-        messages=[{"role": "user", "content": query}],
-        temperature=0,
-        max_tokens=300,
-        tools=tool_schema(),
-        tool_choice="auto",
-    )
+    if natural_language:
+        cached_reply = await asyncio.to_thread(REPLY_CACHE.lookup, query)
+        if cached_reply is not None:
+            return cached_reply
+
+    user_message = {"role": "user", "content": query}
+    response = await CREATE_WITH_TOOLS(messages=[user_message])
     groq_response = response.choices[0].message
 
     tool_calls = groq_response.tool_calls or []
     if not tool_calls:
         return groq_response.content or "Model did not return any content."
 
-    args = json.loads(tool_calls[0].function.arguments)
-    weather_data = get_current_weather(**args)
+    # Run every requested lookup (e.g. one per city) concurrently.
+    tool_outputs = await asyncio.gather(
+        *(execute_tool_call(call) for call in tool_calls)
+    )
+    if not natural_language:
+        return "\n".join(tool_outputs)
+
+    if len(tool_outputs) == 1:
+        location = orjson.loads(tool_calls[0].function.arguments).get("location", "")
+        report = render_weather_report(query, location, tool_outputs[0])
+        if report is not None:
+            return report
 
-    second_response = client.chat.completions.create(
-        model="openai/gpt-oss-20b",
+    second_stream = await CREATE_FOLLOW_UP(
         messages=[
-            {"role": "user", "content": query},
-            {
-                "role": "assistant",
-                "content": groq_response.content,
-                "tool_calls": [
-                    {
-                        "id": tool_calls[0].id,
-                        "type": tool_calls[0].type,
-                        "function": {
-                            "name": tool_calls[0].function.name,
-                            "arguments": tool_calls[0].function.arguments,
-                        },
-                    }
-                ],
-            },
-            {
-                "role": "tool",
-                "tool_call_id": tool_calls[0].id,
-                "content": weather_data,
-            },
+            user_message,
+            groq_response.model_dump(
+                include={"role", "content", "tool_calls"},
+                exclude_none=True,
+                mode="json",
+            ),
+            *(
+                {"role": "tool", "tool_call_id": call.id, "content": output}
+                for call, output in zip(tool_calls, tool_outputs)
+            ),
         ],
-        temperature=0,
-        max_tokens=300,
     )
 
-    return second_response.choices[0].message.content
+    parts: List[str] = []
+    async for chunk in second_stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            await ctx.report_progress(len(parts), message=delta)
+
+    reply = "".join(parts)
+    if reply:
+        await asyncio.to_thread(REPLY_CACHE.store, query, reply)
+    return reply
 
 
 @mcp.tool()
-def get_weather_direct(location: str) -> str:
+async def get_weather_direct(location: str) -> str:
     """
     Bypass the LLM entirely and return the structured weather payload directly.
     """
 
-    return get_current_weather(location)
+    return await get_current_weather(location)
 
 
 if __name__ == "__main__":
-    mcp.run()
+    # Equivalent to mcp.run() (STDIO transport), but on uvloop's libuv-based
+    # event loop where available; uvloop does not support Windows.
+    anyio.run(
+        mcp.run_stdio_async,
+        backend_options={"use_uvloop": sys.platform != "win32"},
+    )
 
@@ -12,10 +12,13 @@ answer.
 Example command (run from repo root or after activating the conda env):
     python tool-calling/groq_weather_function_call.py --location "Bengaluru, IN"
 
+Ask about several cities at once (the questions run concurrently):
+    python tool-calling/groq_weather_function_call.py --locations "Bengaluru, IN; Paris, FR"
+
 Sample output (truncated):
     Asking the model: What is the weather like in Bengaluru, IN?
     ...
-    Tool output (JSON): {"location": "Bengaluru, IN", "temperature_c": 26.87, ...}
+    Tool output (JSON): {"location":"Bengaluru, IN","temperature_c":26.87,...}
     Final assistant reply:
     🌤️ Bengaluru, IN – Current Weather
     - Temperature: 26.9 °C (≈ 80 °F)
@@ -28,13 +31,16 @@ Sample output (truncated):
 """
 
 import argparse
-import json
+import asyncio
+import functools
 import os
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-import requests
+import httpx
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from groq import Groq
+from groq import AsyncGroq
 
 # Automatically pull variables from a local .env file if present.
 load_dotenv()
@@ -53,18 +59,72 @@ def require_env(var_name: str) -> str:
 
 
 # Instantiate the Groq client up front so we can reuse the HTTP session.
-client = Groq(api_key=require_env("GROQ_API_KEY"))
+client = AsyncGroq(api_key=require_env("GROQ_API_KEY"))
+
+# Share one HTTP/2 client across tool calls so concurrent OpenWeatherMap
+# requests are multiplexed over a single keep-alive connection.
+HTTP = httpx.AsyncClient(
+    transport=httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=3,  # Connection failures only; status retries are below.
+        limits=httpx.Limits(max_keepalive_connections=20),
+    ),
+    timeout=10.0,
+)
+
+# Transient OpenWeatherMap statuses worth retrying (httpx only retries failed
+# connections, not error responses).
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+# Weather changes on the order of minutes, so repeat lookups for the same
+# location are answered from memory instead of re-hitting OpenWeatherMap.
+WEATHER_CACHE: TTLCache = TTLCache(maxsize=512, ttl=300)
 
+# Lookups currently on the wire, so concurrent callers asking for the same
+# location await one shared request instead of issuing duplicates.
+INFLIGHT_WEATHER: Dict[str, "asyncio.Task[str]"] = {}
 
-def get_current_weather(location: str) -> str:
+
+async def get_current_weather(location: str) -> str:
     """
     Fetch the current weather for the supplied location using OpenWeatherMap.
 
     This function is registered as a "tool" so the LLM can choose to call it
     when it needs structured weather data. The result is returned as a JSON
-    string to match the tool-calling contract.
+    string to match the tool-calling contract. Results are served from the TTL
+    cache when fresh, and concurrent calls for one location share a request.
     """
 
+    cache_key = location.strip().lower()
+    cached = WEATHER_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    # Join an in-flight request for this location if there is one.
+    pending = INFLIGHT_WEATHER.get(cache_key)
+    if pending is None:
+        pending = asyncio.ensure_future(fetch_weather(location))
+        INFLIGHT_WEATHER[cache_key] = pending
+        pending.add_done_callback(lambda _: INFLIGHT_WEATHER.pop(cache_key, None))
+    # Shield the shared request so one caller being cancelled doesn't fail the rest.
+    return await asyncio.shield(pending)
+
+
+async def get_with_retries(url: str, params: Dict[str, str]) -> httpx.Response:
+    """GET url, retrying up to three times with backoff on 429/5xx responses."""
+
+    response = await HTTP.get(url, params=params)
+    for attempt in range(3):
+        if response.status_code not in RETRY_STATUSES:
+            break
+        await asyncio.sleep(0.2 * 2**attempt)
+        response = await HTTP.get(url, params=params)
+    return response
+
+
+async def fetch_weather(location: str) -> str:
+    """Call OpenWeatherMap and cache the condensed payload on success."""
+
     api_key = require_env("OPENWEATHER_API_KEY")
     params = {
         "q": location,
@@ -73,16 +133,14 @@ def get_current_weather(location: str) -> str:
     }
 
     try:
-        response = requests.get(
-            "https://api.openweathermap.org/data/2.5/weather",
-            params=params,
-            timeout=10,
+        response = await get_with_retries(
+            "https://api.openweathermap.org/data/2.5/weather", params
         )
         response.raise_for_status()
-    except requests.RequestException as exc:
-        return json.dumps({"error": f"OpenWeatherMap request failed: {exc}"})
+    except httpx.HTTPError as exc:
+        return orjson.dumps({"error": f"OpenWeatherMap request failed: {exc}"}).decode()
 
-    payload = response.json()
+    payload = orjson.loads(response.content)
     weather = {
         "location": location,
         "temperature_c": payload["main"]["temp"],
@@ -93,11 +151,13 @@ def get_current_weather(location: str) -> str:
         "description": payload["weather"][0]["description"],
         "icon": payload["weather"][0]["icon"],
     }
-    return json.dumps(weather)
+    result = orjson.dumps(weather).decode()
+    WEATHER_CACHE[location.strip().lower()] = result
+    return result
 
 
 # Describe the tool so the LLM knows when/how to call it.
-tools = [
+TOOL_SCHEMA: List[Dict] = [
     {
         "type": "function",
         "function": {
@@ -117,32 +177,84 @@ tools = [
     }
 ]
 
+# Shared, byte-identical prompt prefix (tools + system message) across every
+# request, so the provider's automatic prompt caching can reuse it.
+SYSTEM_MESSAGE: Dict[str, str] = {
+    "role": "system",
+    "content": "You are a friendly weather assistant that uses tools when needed.",
+}
+
+# Both completion calls with their static settings bound once at import time.
+# Both send TOOL_SCHEMA: tool definitions lead the prompt, so the follow-up
+# only shares the first call's cached prefix if it carries them too. The
+# follow-up sets tool_choice="none" so the model must answer in text.
+CREATE_WITH_TOOLS = functools.partial(
+    client.chat.completions.create,
+    model="openai/gpt-oss-20b",
+    temperature=0,
+    max_tokens=300,
+    tools=TOOL_SCHEMA,
+    tool_choice="auto",
+)
+CREATE_FOLLOW_UP = functools.partial(
+    client.chat.completions.create,
+    model="openai/gpt-oss-20b",
+    tools=TOOL_SCHEMA,
+    tool_choice="none",
+    temperature=0.2,
+    max_tokens=400,
+)
+
+
+async def execute_tool_call(call) -> Dict[str, str]:
+    """
+    Run a single weather tool call and wrap its output as a tool message.
 
-def call_model_with_tools(question: str) -> None:
+    Unknown tool names get an error payload rather than being dropped: every
+    tool_call_id echoed back to the model needs a matching tool message.
+    """
+
+    if call.function.name != "get_current_weather":
+        print(f"Unknown tool requested: {call.function.name}")
+        error = f"Unknown tool: {call.function.name}"
+        tool_output = orjson.dumps({"error": error}).decode()
+    else:
+        args = orjson.loads(call.function.arguments)
+        print("\nTool call arguments from the model:", args)
+
+        tool_output = await get_current_weather(**args)
+        print("Tool output (JSON):", tool_output)
+
+    return {
+        "role": "tool",
+        "tool_call_id": call.id,
+        "name": call.function.name,
+        "content": tool_output,
+    }
+
+
+async def call_model_with_tools(
+    question: str, stream: bool = True, raw: bool = False
+) -> Optional[str]:
     """
     Orchestrate the two-step tool-calling flow:
     1. Ask the LLM the user's question and let it decide whether to call a tool.
     2. If it calls the weather tool, execute it locally and send the result back
        to the LLM for a natural-language answer.
+
+    The final reply is returned. With stream=True it is also printed token by
+    token as it arrives; pass stream=False when several questions run at once
+    so their replies don't interleave. With raw=True step 2 is skipped and the
+    tool output JSON is returned instead.
     """
 
     initial_messages: List[Dict[str, str]] = [
-        {
-            "role": "system",
-            "content": "You are a friendly weather assistant that uses tools when needed.",
-        },
+        SYSTEM_MESSAGE,
         {"role": "user", "content": question},
     ]
 
     # Step 1: Ask the model the question with the tool definition attached.
-    response = client.chat.completions.create(
-        model="openai/gpt-oss-20b",
-        messages=initial_messages,
-        temperature=0,
-        max_tokens=300,
-        tools=tools,
-        tool_choice="auto",
-    )
+    response = await CREATE_WITH_TOOLS(messages=initial_messages)
 
     assistant_message = response.choices[0].message
     print("\nInitial assistant response (should contain a tool call):")
@@ -152,63 +264,62 @@ def call_model_with_tools(question: str) -> None:
     if not tool_calls:
         print("Model did not request a tool. Direct answer:")
         print(assistant_message.content)
-        return
+        return assistant_message.content
 
-    # Execute each requested tool call locally.
-    tool_messages = []
-    for call in tool_calls:
-        if call.function.name != "get_current_weather":
-            print(f"Skipping unknown tool: {call.function.name}")
-            continue
-
-        args = json.loads(call.function.arguments)
-        print("\nTool call arguments from the model:", args)
-
-        tool_output = get_current_weather(**args)
-        print("Tool output (JSON):", tool_output)
-
-        tool_messages.append(
-            {
-                "role": "tool",
-                "tool_call_id": call.id,
-                "name": call.function.name,
-                "content": tool_output,
-            }
-        )
+    # Execute the requested tool calls locally and concurrently.
+    tool_messages = await asyncio.gather(
+        *(execute_tool_call(call) for call in tool_calls)
+    )
 
-    if not tool_messages:
-        print("No tool output to send back to the model; stopping here.")
-        return
+    if raw:
+        return "\n".join(message["content"] for message in tool_messages)
 
     # Step 2: Send the tool outputs back to the LLM for a final response.
+    # Echo the assistant turn straight from the SDK model; only the fields the
+    # API accepts back are kept (SDKs add provider-specific extras).
     follow_up_messages: List[Dict[str, object]] = initial_messages + [
-        {
-            "role": "assistant",
-            "content": assistant_message.content,
-            "tool_calls": [
-                {
-                    "id": call.id,
-                    "type": call.type,
-                    "function": {
-                        "name": call.function.name,
-                        "arguments": call.function.arguments,
-                    },
-                }
-                for call in tool_calls
-            ],
-        },
+        assistant_message.model_dump(
+            include={"role", "content", "tool_calls"}, exclude_none=True, mode="json"
+        ),
         *tool_messages,
     ]
 
-    final_response = client.chat.completions.create(
-        model="openai/gpt-oss-20b",
-        messages=follow_up_messages,
-        temperature=0.2,
-        max_tokens=400,
-    )
+    if not stream:
+        final_response = await CREATE_FOLLOW_UP(messages=follow_up_messages)
+        return final_response.choices[0].message.content
+
+    # Stream the final answer so text appears as soon as the first token lands.
+    final_stream = await CREATE_FOLLOW_UP(messages=follow_up_messages, stream=True)
 
     print("\nFinal assistant reply:")
-    print(final_response.choices[0].message.content)
+    parts: List[str] = []
+    async for chunk in final_stream:
+        delta = chunk.choices[0].delta.content if chunk.choices else None
+        if delta:
+            parts.append(delta)
+            print(delta, end="", flush=True)
+    print()
+    return "".join(parts)
+
+
+async def run_many(
+    locations: List[str], concurrency: int = 8, raw: bool = False
+) -> List[Optional[str]]:
+    """
+    Ask about several locations concurrently and return the replies in order.
+
+    A semaphore bounds how many questions are in flight at once; repeated
+    locations collapse to a single OpenWeatherMap request via the cache.
+    """
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def ask(location: str) -> Optional[str]:
+        async with semaphore:
+            question = f"What is the weather like in {location}?"
+            return await call_model_with_tools(question, stream=False, raw=raw)
+
+    return await asyncio.gather(*(ask(location) for location in locations))
 
 
 def parse_cli_args() -> argparse.Namespace:
@@ -222,17 +333,50 @@ def parse_cli_args() -> argparse.Namespace:
         default="Bengaluru, IN",
         help="City to ask about (defaults to 'Bengaluru, IN').",
     )
+    parser.add_argument(
+        "--locations",
+        help=(
+            "Semicolon-separated cities to ask about concurrently "
+            "(e.g. 'Bengaluru, IN; Paris, FR'). Overrides --location."
+        ),
+    )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Print the tool's JSON output and skip the second LLM call.",
+    )
     return parser.parse_args()
 
 
+async def run(locations: List[str], raw: bool = False) -> None:
+    """Answer the question(s), then release the pooled HTTP connections."""
+
+    try:
+        if len(locations) == 1:
+            question = f"What is the weather like in {locations[0]}?"
+            print(f"Asking the model: {question}")
+            await call_model_with_tools(question, raw=raw)
+            return
+
+        print(f"Asking the model about {len(locations)} locations concurrently.")
+        replies = await run_many(locations, raw=raw)
+        for location, reply in zip(locations, replies):
+            print(f"\nFinal assistant reply for {location}:")
+            print(reply)
+    finally:
+        await HTTP.aclose()
+
+
 def main() -> None:
     """Entry point when executing the module as a script."""
 
     args = parse_cli_args()
-    question = f"What is the weather like in {args.location}?"
+    if args.locations:
+        locations = [loc.strip() for loc in args.locations.split(";") if loc.strip()]
+    else:
+        locations = [args.location]
 
-    print(f"Asking the model: {question}")
-    call_model_with_tools(question)
+    asyncio.run(run(locations, raw=args.raw))
 
 
 if __name__ == "__main__":
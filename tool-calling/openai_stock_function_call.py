@@ -11,13 +11,16 @@ language answer.
 """
 
 import argparse
-import json
+import asyncio
+import functools
 import os
+import threading
 from typing import Dict, List
 
-import yfinance as yf
+import orjson
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 load_dotenv()
 
@@ -34,7 +37,27 @@ def require_env(var_name: str) -> str:
     return value
 
 
-client = OpenAI(api_key=require_env("OPENAI_API_KEY"))
+client = AsyncOpenAI(api_key=require_env("OPENAI_API_KEY"))
+
+# Intraday prices move quickly, so only keep quotes around briefly. Tool calls
+# run in worker threads, hence the lock around the (non thread-safe) cache.
+PRICE_CACHE: TTLCache = TTLCache(maxsize=256, ttl=30)
+PRICE_CACHE_LOCK = threading.Lock()
+
+# yfinance drags in pandas and numpy, so it is imported on first use rather
+# than at startup; runs that never call the tool don't pay for it.
+_yf = None
+
+
+def get_yfinance():
+    """Import yfinance on first use and return the module."""
+
+    global _yf
+    if _yf is None:
+        import yfinance
+
+        _yf = yfinance
+    return _yf
 
 
 def get_current_stock_price(stock_symbol: str) -> str:
@@ -46,16 +69,25 @@ def get_current_stock_price(stock_symbol: str) -> str:
     """
 
     if not stock_symbol:
-        return json.dumps({"error": "Missing stock_symbol argument."})
+        return orjson.dumps({"error": "Missing stock_symbol argument."}).decode()
 
+    cache_key = stock_symbol.strip().upper()
+    with PRICE_CACHE_LOCK:
+        cached = PRICE_CACHE.get(cache_key)
+    if cached is not None:
+        return cached
+
+    yf = get_yfinance()
     try:
         ticker = yf.Ticker(stock_symbol)
         history = ticker.history(period="1d")
     except Exception as exc:  # yfinance raises a variety of exceptions
-        return json.dumps({"error": f"Unable to fetch data for {stock_symbol}: {exc}"})
+        error = f"Unable to fetch data for {stock_symbol}: {exc}"
+        return orjson.dumps({"error": error}).decode()
 
     if history.empty:
-        return json.dumps({"error": f"No pricing data returned for {stock_symbol}."})
+        error = f"No pricing data returned for {stock_symbol}."
+        return orjson.dumps({"error": error}).decode()
 
     latest_row = history.iloc[-1]
     price_data = {
@@ -64,10 +96,13 @@ def get_current_stock_price(stock_symbol: str) -> str:
         "currency": ticker.fast_info.get("currency", "UNKNOWN"),
         "timestamp": latest_row.name.isoformat(),
     }
-    return json.dumps(price_data)
+    result = orjson.dumps(price_data).decode()
+    with PRICE_CACHE_LOCK:
+        PRICE_CACHE[cache_key] = result
+    return result
 
 
-tools = [
+TOOL_SCHEMA: List[Dict] = [
     {
         "type": "function",
         "function": {
@@ -87,90 +122,114 @@ tools = [
     }
 ]
 
+# Shared, byte-identical prompt prefix (tools + system message) across every
+# request, so the provider's automatic prompt caching can reuse it.
+SYSTEM_MESSAGE: Dict[str, str] = {
+    "role": "system",
+    "content": (
+        "You are an enthusiastic financial assistant. "
+        "Use the provided tools to ensure prices are accurate."
+    ),
+}
+
+# Both completion calls with their static settings bound once at import time.
+# Both send TOOL_SCHEMA: tool definitions lead the prompt, so the follow-up
+# only shares the first call's cached prefix if it carries them too. The
+# follow-up sets tool_choice="none" so the model must answer in text.
+CREATE_WITH_TOOLS = functools.partial(
+    client.chat.completions.create,
+    model="gpt-3.5-turbo",
+    temperature=0,
+    max_tokens=300,
+    tools=TOOL_SCHEMA,
+    tool_choice="auto",
+)
+CREATE_FOLLOW_UP = functools.partial(
+    client.chat.completions.create,
+    model="gpt-3.5-turbo",
+    tools=TOOL_SCHEMA,
+    tool_choice="none",
+    temperature=0.2,
+    max_tokens=400,
+    stream=True,
+)
+
+
+async def execute_tool_call(call) -> Dict[str, str]:
+    """
+    Run a single stock-price tool call off the event loop and wrap its output.
+
+    Unknown tool names get an error payload rather than being dropped: every
+    tool_call_id echoed back to the model needs a matching tool message.
+    """
+
+    if call.function.name != "get_current_stock_price":
+        print(f"Unsupported tool call: {call.function.name}")
+        error = f"Unknown tool: {call.function.name}"
+        tool_output = orjson.dumps({"error": error}).decode()
+    else:
+        args = orjson.loads(call.function.arguments)
+        print("\nTool call arguments:", args)
+        tool_output = await asyncio.to_thread(get_current_stock_price, **args)
+        print("Tool output (JSON):", tool_output)
+
+    return {
+        "role": "tool",
+        "tool_call_id": call.id,
+        "name": call.function.name,
+        "content": tool_output,
+    }
+
 
-def call_model_with_tools(question: str) -> None:
+async def call_model_with_tools(question: str, raw: bool = False) -> None:
     """
     Ask the model the user's question, fulfill any tool calls, and print the reply.
+
+    With raw=True the tool output printed above is the answer and the second
+    LLM call is skipped.
     """
 
     initial_messages: List[Dict[str, str]] = [
-        {
-            "role": "system",
-            "content": (
-                "You are an enthusiastic financial assistant. "
-                "Use the provided tools to ensure prices are accurate."
-            ),
-        },
+        SYSTEM_MESSAGE,
         {"role": "user", "content": question},
     ]
 
-    response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=initial_messages,
-        temperature=0,
-        max_tokens=300,
-        tools=tools,
-        tool_choice="auto",
-    )
+    response = await CREATE_WITH_TOOLS(messages=initial_messages)
 
     assistant_message = response.choices[0].message
     print("\nInitial assistant response:")
     print(assistant_message)
 
     tool_calls = assistant_message.tool_calls or []
-    tool_messages = []
-    for call in tool_calls:
-        if call.function.name != "get_current_stock_price":
-            print(f"Skipping unsupported tool call: {call.function.name}")
-            continue
-
-        args = json.loads(call.function.arguments)
-        print("\nTool call arguments:", args)
-        tool_output = get_current_stock_price(**args)
-        print("Tool output (JSON):", tool_output)
-
-        tool_messages.append(
-            {
-                "role": "tool",
-                "tool_call_id": call.id,
-                "name": call.function.name,
-                "content": tool_output,
-            }
-        )
+    tool_messages = await asyncio.gather(
+        *(execute_tool_call(call) for call in tool_calls)
+    )
 
     if not tool_messages:
         print("\nModel response without tool call:")
         print(assistant_message.content)
         return
 
+    if raw:
+        return
+
+    # Echo the assistant turn straight from the SDK model; only the fields the
+    # API accepts back are kept (SDKs add provider-specific extras).
     follow_up_messages: List[Dict[str, object]] = initial_messages + [
-        {
-            "role": "assistant",
-            "content": assistant_message.content,
-            "tool_calls": [
-                {
-                    "id": call.id,
-                    "type": call.type,
-                    "function": {
-                        "name": call.function.name,
-                        "arguments": call.function.arguments,
-                    },
-                }
-                for call in tool_calls
-            ],
-        },
+        assistant_message.model_dump(
+            include={"role", "content", "tool_calls"}, exclude_none=True, mode="json"
+        ),
         *tool_messages,
     ]
 
-    final_response = client.chat.completions.create(
-        model="gpt-3.5-turbo",
-        messages=follow_up_messages,
-        temperature=0.2,
-        max_tokens=400,
-    )
+    # Stream the final answer so text appears as soon as the first token lands.
+    final_stream = await CREATE_FOLLOW_UP(messages=follow_up_messages)
 
     print("\nFinal assistant reply:")
-    print(final_response.choices[0].message.content)
+    async for chunk in final_stream:
+        if chunk.choices:
+            print(chunk.choices[0].delta.content or "", end="", flush=True)
+    print()
 
 
 def parse_cli_args() -> argparse.Namespace:
@@ -184,6 +243,11 @@ def parse_cli_args() -> argparse.Namespace:
         default="TECHM.NS",
         help="Ticker symbol to query (default: TECHM.NS).",
     )
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Print the tool's JSON output and skip the second LLM call.",
+    )
     return parser.parse_args()
 
 
@@ -194,7 +258,7 @@ def main() -> None:
     question = f"What is the price of {args.symbol}?"
 
     print(f"Asking the model: {question}")
-    call_model_with_tools(question)
+    asyncio.run(call_model_with_tools(question, raw=args.raw))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+"""
+Semantic response cache for LLM replies.
+
+Each query is embedded with a small sentence-transformers model and stored in
+an in-memory FAISS inner-product index next to the reply it produced. When a
+new query is close enough (cosine similarity above the threshold) to one seen
+before, the stored reply is returned and the LLM round-trips are skipped.
+Expired entries are dropped, and the oldest ones evicted past max_entries,
+whenever a new query is stored or the cache is saved.
+
+faiss, numpy and sentence-transformers are imported on first use (or when a
+saved cache is loaded), so an unused cache adds nothing to startup time.
+
+Usage:
+    cache = SemanticCache(path="cache/weather")
+    reply = cache.lookup("What's the weather like in Bengaluru, IN?")
+    if reply is None:
+        reply = ...  # ask the LLM
+        cache.store("What's the weather like in Bengaluru, IN?", reply)
+    cache.save()  # optional: persist the index and replies to disk
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, List, Optional
+
+if TYPE_CHECKING:
+    import faiss
+    import numpy as np
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class SemanticCache:
+    """Map semantically similar queries to a previously generated reply."""
+
+    def __init__(
+        self,
+        threshold: float = 0.95,
+        ttl: Optional[float] = None,
+        model_name: str = DEFAULT_MODEL,
+        path: Optional[str] = None,
+        max_entries: int = 1024,
+    ) -> None:
+        self.threshold = threshold
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.model_name = model_name
+        self.path = path
+
+        self._lock = threading.Lock()
+        self._encoder = None
+        self._index: Optional[faiss.IndexFlatIP] = None
+        self._responses: List[str] = []
+        self._stored_at: List[float] = []
+
+        if path and os.path.exists(f"{path}.faiss"):
+            self._load(path)
+
+    def lookup(self, query: str) -> Optional[str]:
+        """Return the cached reply for a similar query, or None on a miss."""
+
+        vector = self._embed(query)
+        with self._lock:
+            position = self._best_match(vector)
+            if position is None:
+                return None
+            age = time.time() - self._stored_at[position]
+            if self.ttl is not None and age > self.ttl:
+                return None
+            return self._responses[position]
+
+    def store(self, query: str, response: str) -> None:
+        """Remember the reply for this query, replacing a near-duplicate entry."""
+
+        vector = self._embed(query)
+        with self._lock:
+            position = self._best_match(vector)
+            if position is not None:
+                self._responses[position] = response
+                self._stored_at[position] = time.time()
+                return
+
+            import faiss
+
+            if self._index is None:
+                self._index = faiss.IndexFlatIP(vector.shape[1])
+            self._prune(self.max_entries - 1)
+            self._index.add(vector)
+            self._responses.append(response)
+            self._stored_at.append(time.time())
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the FAISS index and the stored replies next to each other."""
+
+        path = path or self.path
+        if not path or self._index is None:
+            return
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        import faiss
+
+        with self._lock:
+            self._prune(self.max_entries)
+            faiss.write_index(self._index, f"{path}.faiss")
+            with open(f"{path}.json", "w", encoding="utf-8") as handle:
+                json.dump(
+                    {"responses": self._responses, "stored_at": self._stored_at},
+                    handle,
+                )
+
+    def _load(self, path: str) -> None:
+        """Restore a cache previously written by save()."""
+
+        import faiss
+
+        self._index = faiss.read_index(f"{path}.faiss")
+        with open(f"{path}.json", encoding="utf-8") as handle:
+            data = json.load(handle)
+        self._responses = data["responses"]
+        self._stored_at = data["stored_at"]
+
+    def _prune(self, limit: int) -> None:
+        """Rebuild the index without expired rows and with at most limit rows."""
+
+        keep = list(range(len(self._responses)))
+        if self.ttl is not None:
+            now = time.time()
+            keep = [i for i in keep if now - self._stored_at[i] <= self.ttl]
+        if len(keep) > limit:
+            newest = sorted(keep, key=self._stored_at.__getitem__)[len(keep) - limit :]
+            keep = sorted(newest)
+        if len(keep) == len(self._responses):
+            return
+
+        import faiss
+
+        vectors = self._index.reconstruct_n(0, self._index.ntotal)[keep]
+        self._index = faiss.IndexFlatIP(self._index.d)
+        if keep:
+            self._index.add(vectors)
+        self._responses = [self._responses[i] for i in keep]
+        self._stored_at = [self._stored_at[i] for i in keep]
+
+    def _embed(self, text: str) -> np.ndarray:
+        """Encode text as a normalised float32 row vector (cosine == inner product)."""
+
+        import numpy as np
+
+        if self._encoder is None:
+            with self._lock:
+                if self._encoder is None:
+                    # Imported lazily: sentence-transformers pulls in torch,
+                    # which we only pay for once the cache is actually used.
+                    from sentence_transformers import SentenceTransformer
+
+                    self._encoder = SentenceTransformer(self.model_name)
+
+        vector = self._encoder.encode([text], normalize_embeddings=True)
+        return np.asarray(vector, dtype="float32")
+
+    def _best_match(self, vector: np.ndarray) -> Optional[int]:
+        """Return the position of the closest stored query above the threshold."""
+
+        if self._index is None or self._index.ntotal == 0:
+            return None
+
+        scores, positions = self._index.search(vector, 1)
+        if scores[0][0] < self.threshold:
+            return None
+        return int(positions[0][0])